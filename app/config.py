@@ -1,21 +1,34 @@
 import os
 from pathlib import Path
+from typing import Final
 from dotenv import load_dotenv
 
 # This anchors everything to "chicago-crime/" no matter where scripts run
 BASE_DIR = Path(__file__).resolve().parent.parent
 ENV_PATH = BASE_DIR / ".env"
 
-# STEP 2: Load the .env file
-load_dotenv(dotenv_path=ENV_PATH)
+# STEP 2: Load the .env file ONCE per interpreter.
+# The sentinel keeps test runners / importlib.reload from re-parsing the
+# file, and the snapshot below avoids repeated os.environ dict lookups.
+_LOADED = False
+
+def _load_env_once() -> dict:
+    global _LOADED
+    if not _LOADED:
+        load_dotenv(dotenv_path=ENV_PATH)
+        _LOADED = True
+    # Snapshot environ once; Config reads come from this plain dict
+    return dict(os.environ)
+
+_ENV = _load_env_once()
 
 class Config:
     """Production configuration loader."""
 
     # --- DATABASE CONFIGURATION FOR SQLITE AT ROOT---
-    
+
     # 1. Get the raw string from .env (e.g., "sqlite:///chicago_crime.db")
-    _raw_url = os.getenv("DATABASE_URL")
+    _raw_url = _ENV.get("DATABASE_URL")
     
     if not _raw_url:
         raise ValueError("Critical: DATABASE_URL is missing in .env file.")
@@ -30,17 +43,18 @@ class Config:
         if not Path(filename).is_absolute():
             # Create the absolute path: /Users/You/chicago-crime/chicago_crime.db
             abs_path = BASE_DIR / filename
-            DB_URL = f"sqlite:///{abs_path}"
+            DB_URL: Final[str] = f"sqlite:///{abs_path}"
         else:
-            DB_URL = _raw_url
+            DB_URL: Final[str] = _raw_url
     else:
         # For Postgres/MySQL, use as-is
-        DB_URL = _raw_url
+        DB_URL: Final[str] = _raw_url
 
     # --- API Credentials ---
-    API_TOKEN: str = os.environ.get("SOCRATA_APP_TOKEN", "")
-    API_USER: str = os.environ.get("SOCRATA_USERNAME", "")
-    API_PASS: str = os.environ.get("SOCRATA_PASSWORD", "")
+    # Populated once from the _ENV snapshot, not live os.environ lookups
+    API_TOKEN: Final[str] = _ENV.get("SOCRATA_APP_TOKEN", "")
+    API_USER: Final[str] = _ENV.get("SOCRATA_USERNAME", "")
+    API_PASS: Final[str] = _ENV.get("SOCRATA_PASSWORD", "")
 
     @classmethod
     def validate(cls):
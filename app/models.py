@@ -1,19 +1,27 @@
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, Integer, Float, Boolean, DateTime
+from sqlalchemy import String, Integer, Float, Boolean, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from app.database import Base
 
 class CrimeRecord(Base):
     __tablename__ = "crime_records"
 
+    # Composite (date, id) covers the daily job's max(date) lookup and
+    # 'date >=' range scans without touching the table. Every extra
+    # single-column index roughly doubles write amplification on bulk
+    # insert, so we only keep the ones our queries actually use.
+    __table_args__ = (
+        Index("ix_crime_date_id", "date", "id"),
+    )
+
     # 1. Primary Key: We turn OFF autoincrement because we want to use 
     # the existing unique 'id' provided by the Chicago Data Portal.
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
 
     # 2. Identifiers
-    # Case Number is the business key. Unique and indexed for fast lookups.
-    case_number: Mapped[str] = mapped_column(String(20), index=True)
+    # Case Number is the business key (not indexed: no current query filters on it)
+    case_number: Mapped[str] = mapped_column(String(20))
     
     # 3. Timestamps
     # 'date' is a reserved keyword in some SQL dialects, but SQLAlchemy handles escaping.
@@ -47,12 +55,22 @@ class CrimeRecord(Base):
     latitude: Mapped[Optional[float]] = mapped_column(Float)
     longitude: Mapped[Optional[float]] = mapped_column(Float)
     
-    # 8. Partitioning/Filtering
-    year: Mapped[Optional[int]] = mapped_column(Integer, index=True)
+    # 8. Partitioning/Filtering (not indexed: no current query filters on it)
+    year: Mapped[Optional[int]] = mapped_column(Integer)
 
     # Note: We omitted the 'location' column (the composite object) 
     # because 'latitude' and 'longitude' already store that data efficiently.
 
+class PipelineState(Base):
+    __tablename__ = "pipeline_state"
+    # One row per job. The daily job reads its checkpoint here in O(1)
+    # instead of aggregating MAX(date) over the whole fact table, and
+    # (last_date, last_id) gives an exact resume point.
+    job_name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    last_date: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    last_id: Mapped[Optional[int]] = mapped_column(Integer)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+
 class CommunityArea(Base):
     __tablename__ = "dim_community_areas"
     # Socrata API Field: 'area_num_1' or 'area_numbe' usually
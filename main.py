@@ -1,7 +1,7 @@
 import argparse
 import sys
 import logging
-from app.database import init_db
+from app.database import init_db, _create_database_if_not_exists
 # Import the logic functions directly (refactor scripts to export functions)
 from scripts.run_backfill import main as run_backfill_task
 from scripts.run_daily import main as run_daily_task
@@ -27,6 +27,8 @@ def main():
     try:
         if args.mode == "init":
             logger.info("Initializing Database Schema...")
+            # One-time bootstrap: only 'init' is allowed to issue CREATE DATABASE
+            _create_database_if_not_exists()
             init_db()
             logger.info("Database initialized successfully.")
 
@@ -1,19 +1,13 @@
-import sys
-import os
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError, ProgrammingError
 from sqlalchemy.orm import Session
 
-# --- STEP 0: ENVIRONMENT SETUP ---
-current_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(current_dir)
-sys.path.append(parent_dir)
-
 from app.database import engine
-from app.models import CrimeRecord 
+from app.models import CrimeRecord, PipelineState
 from app.services.api_client import fetch_crime_data
-from app.services.etl import clean_data, load_data_bulk
+from app.services.etl import WATERMARK_JOB, clean_data, load_data_bulk
 
 # Configure Logging
 logging.basicConfig(
@@ -25,12 +19,31 @@ logger = logging.getLogger(__name__)
 
 def get_last_crime_date() -> datetime | None:
     """
-    Queries the database for the most recent crime timestamp.
-    Returns None if the database is empty.
+    Reads the ETL checkpoint for the daily job.
+
+    The watermark row is O(1) versus aggregating MAX(date) over the
+    whole fact table. Databases loaded before the pipeline_state table
+    existed get it created here once and fall back to MAX(date);
+    load_data_bulk keeps the watermark current from then on. Warm runs
+    do no DDL at all — the checkpoint read doubles as the probe.
     """
-    stmt = select(func.max(CrimeRecord.date))
     with Session(engine) as session:
-        return session.scalar(stmt)
+        try:
+            watermark = session.scalar(
+                select(PipelineState.last_date)
+                .where(PipelineState.job_name == WATERMARK_JOB)
+            )
+        except (OperationalError, ProgrammingError):
+            # One-time migration for pre-series databases: create just
+            # the watermark table so the upsert in load_data_bulk works
+            session.rollback()
+            PipelineState.__table__.create(bind=engine, checkfirst=True)
+            watermark = None
+
+        if watermark is not None:
+            return watermark
+        # Legacy fallback: watermark not seeded yet
+        return session.scalar(select(func.max(CrimeRecord.date)))
 
 def main():
     logger.info("=== STARTING DAILY INCREMENTAL JOB ===")
@@ -40,8 +53,10 @@ def main():
         last_date = get_last_crime_date()
 
         if last_date:
-            # Happy Path: Increment by 1 second
-            start_date = last_date + timedelta(seconds=1)
+            # Fetch from the exact watermark: the upsert in load_data_bulk
+            # drops duplicates, so no '+1 second' hack (which silently lost
+            # records sharing the max second) is needed.
+            start_date = last_date
             logger.info(f"Last recorded crime: {last_date}")
             logger.info(f"Fetching data starting from: {start_date}")
         else:
@@ -1,20 +1,14 @@
 import sys
-import os
 import pandas as pd
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from sodapy import Socrata
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
-# --- SETUP PATHS ---
-# Ensures we can import from 'app' regardless of where the script is run
-current_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(current_dir)
-sys.path.append(parent_dir)
-
-from app.config import Config
 from app.database import engine, init_db
 from app.models import CommunityArea, IUCR, Ward, Beat, District
+from app.services.api_client import get_client
 
 # Setup Logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s")
@@ -66,13 +60,16 @@ DIMENSION_CONFIG = {
     }
 }
 
-def fetch_and_load_dimension(session: Session, client: Socrata, model, config: dict):
+def fetch_dimension(client: Socrata, model, config: dict) -> pd.DataFrame:
+    """
+    Fetch + transform one dimension (no DB work — safe to run in a thread).
+    """
     dataset_id = config["dataset_id"]
     mapping = config["mapping"]
     table_name = model.__tablename__
 
-    logger.info(f"--- Processing {table_name} ---")
-    
+    logger.info(f"--- Fetching {table_name} ---")
+
     try:
         # 1. Fetch from API (Dimensions are small, usually < 3000 rows)
         results = client.get(dataset_id, limit=5000)
@@ -80,7 +77,7 @@ def fetch_and_load_dimension(session: Session, client: Socrata, model, config: d
 
         if df.empty:
             logger.warning(f"No data returned for {table_name}")
-            return
+            return df
 
         # 2. Rename Columns (API Name -> Model Name)
         df = df.rename(columns=mapping)
@@ -129,10 +126,22 @@ def fetch_and_load_dimension(session: Session, client: Socrata, model, config: d
         if "is_active" in df.columns:
              df["is_active"] = df["is_active"].astype(str).str.lower() == "true"
 
-        # 5. Truncate & Load
+        return df
+
+    except Exception as e:
+        logger.error(f"❌ Failed to fetch {table_name}: {e}")
+        raise
+
+def load_dimension(session: Session, model, df: pd.DataFrame):
+    """
+    Truncate & load one dimension inside the caller's transaction.
+    """
+    table_name = model.__tablename__
+
+    try:
         # We delete all existing rows to ensure we match the source of truth
         session.execute(text(f"DELETE FROM {table_name}"))
-        
+
         records = df.to_dict(orient="records")
         session.bulk_insert_mappings(model, records)
         logger.info(f"✅ Loaded {len(records)} rows into {table_name}")
@@ -144,32 +153,38 @@ def fetch_and_load_dimension(session: Session, client: Socrata, model, config: d
 def main():
     logger.info("=== STARTING DIMENSION ETL ===")
     
-    # Initialize Client
-    client = Socrata(
-        "data.cityofchicago.org",
-        Config.API_TOKEN,
-        username=Config.API_USER,
-        password=Config.API_PASS,
-        timeout=600
-    )
+    # Shared process-wide client (closed automatically at exit)
+    client = get_client()
 
     # Ensure Tables Exist
     init_db()
 
+    # Phase 1: Fetch all five dimensions in parallel — they're independent
+    # datasets, so total fetch time collapses to the slowest request
+    # instead of the sum of all five.
+    with ThreadPoolExecutor(max_workers=len(DIMENSION_CONFIG)) as executor:
+        futures = {
+            model_cls: executor.submit(fetch_dimension, client, model_cls, config)
+            for model_cls, config in DIMENSION_CONFIG.items()
+        }
+        frames = {model_cls: future.result() for model_cls, future in futures.items()}
+
+    # Phase 2: Load sequentially inside ONE transaction so the truncate
+    # + insert of all dimensions stays atomic.
     with Session(engine) as session:
         try:
-            for model_cls, config in DIMENSION_CONFIG.items():
-                fetch_and_load_dimension(session, client, model_cls, config)
-            
+            for model_cls, df in frames.items():
+                if df.empty:
+                    continue
+                load_dimension(session, model_cls, df)
+
             session.commit()
             logger.info("=== DIMENSION ETL COMPLETE: SUCCESS ===")
-            
+
         except Exception as e:
             session.rollback()
             logger.error(f"Critical Transaction Failure: {e}")
             sys.exit(1)
-        finally:
-            client.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
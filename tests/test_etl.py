@@ -0,0 +1,149 @@
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture(scope="session")
+def sqlite_env(tmp_path_factory):
+    """One throwaway SQLite database shared by the whole test session.
+
+    app.config snapshots the environment and app.database builds the
+    engine at first import, so per-test URLs would be silently ignored.
+    The env must therefore be set exactly once, before any app module
+    loads — the assertion guards against an import sneaking in earlier.
+    """
+    assert "app.config" not in sys.modules, (
+        "app modules were imported before the sqlite_env fixture ran; "
+        "the test database URL would be ignored"
+    )
+    db_path = tmp_path_factory.mktemp("db") / "test.db"
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("SOCRATA_APP_TOKEN", "test-token")
+    os.environ.setdefault("SOCRATA_USERNAME", "test-user")
+    os.environ.setdefault("SOCRATA_PASSWORD", "test-pass")
+
+
+def _raw_page() -> pd.DataFrame:
+    """Two records shaped like a Socrata JSON page (all-string cells,
+    nulls present, 'ward'/'community_area' style gaps included)."""
+    return pd.DataFrame([
+        {
+            "id": "1", "case_number": "HX100001",
+            "date": "2024-01-01T00:00:00.000",
+            "updated_on": "2024-01-08T12:00:00.000",
+            "block": "001XX N STATE ST", "iucr": "0110",
+            "primary_type": "HOMICIDE", "description": "FIRST DEGREE MURDER",
+            "location_description": "STREET",
+            "arrest": "true", "domestic": "false",
+            "beat": "0111", "district": "001", "ward": "42",
+            "community_area": "32", "fbi_code": "01A",
+            "x_coordinate": "1176314", "y_coordinate": "1901775",
+            "latitude": "41.88", "longitude": "-87.62", "year": "2024",
+        },
+        {
+            "id": "2", "case_number": "HX100002",
+            "date": "2024-01-02T03:04:05.000",
+            "updated_on": None,
+            "block": "002XX W MADISON ST", "iucr": "0820",
+            "primary_type": "THEFT", "description": "$500 AND UNDER",
+            "location_description": None,
+            "arrest": "false", "domestic": "false",
+            "beat": "0112", "district": "001", "ward": None,
+            "community_area": None, "fbi_code": "06",
+            "x_coordinate": None, "y_coordinate": None,
+            "latitude": None, "longitude": None, "year": "2024",
+        },
+    ])
+
+
+def test_clean_data_handles_omitted_columns(sqlite_env):
+    """Socrata omits keys that are null for every record in a page."""
+    from app.services.etl import CRIME_SCHEMA, clean_data
+
+    sparse = pd.DataFrame([{
+        "id": "3", "case_number": "HX100003",
+        "date": "2024-01-03T00:00:00.000",
+        "block": "003XX S CLARK ST", "iucr": "0820",
+        "primary_type": "THEFT", "description": "$500 AND UNDER",
+        "arrest": "false", "domestic": "false",
+        "beat": "0113", "district": "001", "fbi_code": "06",
+        "year": "2024",
+        # no updated_on / ward / community_area / coordinates at all
+    }])
+
+    clean = clean_data(sparse)
+
+    assert list(clean.columns) == list(CRIME_SCHEMA.names)
+    assert clean["ward"].isna().all()
+    assert clean["updated_on"].isna().all()
+
+
+def test_load_data_bulk_sqlite_roundtrip(sqlite_env):
+    from sqlalchemy import func, select
+    from sqlalchemy.orm import Session
+
+    from app.database import engine, init_db
+    from app.models import CrimeRecord, PipelineState
+    from app.services.etl import WATERMARK_JOB, clean_data, load_data_bulk
+
+    init_db()
+
+    load_data_bulk(clean_data(_raw_page()))
+
+    with Session(engine) as session:
+        assert session.scalar(select(func.count(CrimeRecord.id))) == 2
+
+        rec = session.get(CrimeRecord, 1)
+        assert rec.date == datetime(2024, 1, 1)
+        assert rec.updated_on == datetime(2024, 1, 8, 12)
+        assert rec.arrest is True
+        assert rec.district == "001"  # zero-padding survives
+
+        rec = session.get(CrimeRecord, 2)
+        assert rec.updated_on is None
+        assert rec.ward is None
+
+        # Watermark advanced in the same transaction as the insert
+        watermark = session.get(PipelineState, WATERMARK_JOB)
+        assert watermark.last_date == datetime(2024, 1, 2, 3, 4, 5)
+        assert watermark.last_id == 2
+
+    # Idempotency: reloading the same page is a no-op, not an error
+    load_data_bulk(clean_data(_raw_page()))
+    with Session(engine) as session:
+        assert session.scalar(select(func.count(CrimeRecord.id))) == 2
+
+
+def test_load_data_bulk_raises_on_null_required_field(sqlite_env):
+    """Conflict handling is scoped to duplicate ids — a NOT NULL
+    violation must surface, not be silently swallowed."""
+    import sqlite3
+
+    from app.database import init_db
+    from app.services.etl import clean_data, load_data_bulk
+
+    init_db()
+
+    bad = _raw_page().assign(id=["98", "99"], arrest=None)
+    with pytest.raises(sqlite3.IntegrityError):
+        load_data_bulk(clean_data(bad))
+
+
+def test_checkpoint_read_migrates_pre_series_db(sqlite_env):
+    """A database from before the watermark series lacks pipeline_state;
+    the checkpoint read must create it and fall back, not crash."""
+    from sqlalchemy import inspect
+
+    from app.database import engine, init_db
+    from app.models import PipelineState
+    from scripts.run_daily import get_last_crime_date
+
+    init_db()
+    PipelineState.__table__.drop(engine, checkfirst=True)
+
+    get_last_crime_date()  # must not raise 'no such table'
+
+    assert inspect(engine).has_table(PipelineState.__tablename__)